@@ -0,0 +1,148 @@
+"""
+Dynamic Request Batching
+========================
+
+Coalesces concurrent single-transaction predictions into one model call.
+
+Each request submits its preprocessed (1, 30) feature row and awaits a
+Future. The row is copied straight into a preallocated (max_batch_size, 30)
+buffer, so callers may reuse their own array as soon as submit() yields.
+A background task waits for up to `max_delay` seconds after the first row
+(or until the buffer is full), runs the model once on the filled slice and
+scatters the fraud probabilities back.
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# predict_fn: (N, 30) float32 matrix -> (N,) fraud probabilities
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+class DynBatcher:
+    """
+    Async micro-batcher around a vectorized predict function.
+
+    Usage:
+        batcher = DynBatcher(lambda X: model.predict_proba(X)[:, 1])
+        await batcher.start()
+        prob_fraud = await batcher.submit(features)
+        await batcher.stop()
+    """
+
+    def __init__(
+        self,
+        predict_fn: PredictFn,
+        max_batch_size: int = 64,
+        max_delay: float = 0.005,
+        n_features: int = 30,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._buffer = np.empty((max_batch_size, n_features), dtype=np.float32)
+        self._futures: List[asyncio.Future] = []
+        self._has_items: Optional[asyncio.Event] = None
+        self._is_full: Optional[asyncio.Event] = None
+        self._has_room: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background batching task on the running event loop."""
+        if self.running:
+            return
+        self._has_items = asyncio.Event()
+        self._is_full = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"DynBatcher started (max_batch_size={self.max_batch_size}, "
+            f"max_delay={self.max_delay * 1000:.1f}ms)"
+        )
+
+    async def stop(self):
+        """Cancel the background task and fail any request still waiting."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Wake submitters waiting for room so they see the batcher stopped
+        if self._has_room is not None:
+            self._has_room.set()
+
+        futures, self._futures = self._futures, []
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, features: np.ndarray) -> float:
+        """
+        Queue one preprocessed feature row and wait for its fraud probability.
+
+        `features` only has to stay valid until this coroutine first yields.
+        """
+        if not self.running:
+            raise RuntimeError("Batcher is not running")
+
+        if len(self._futures) >= self.max_batch_size:
+            # Buffer full: keep a private copy while waiting for the next batch
+            features = features.copy()
+            while len(self._futures) >= self.max_batch_size:
+                await self._has_room.wait()
+                if not self.running:
+                    raise RuntimeError("Batcher stopped")
+
+        index = len(self._futures)
+        self._buffer[index] = features.reshape(-1)
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures.append(future)
+        self._has_items.set()
+        if index + 1 >= self.max_batch_size:
+            self._is_full.set()
+            self._has_room.clear()
+
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._has_items.wait()
+            try:
+                await asyncio.wait_for(self._is_full.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+
+            futures, self._futures = self._futures, []
+            self._has_items.clear()
+            self._is_full.clear()
+            self._has_room.set()
+
+            # Runs without yielding, so no submit() can overwrite the buffer
+            # before the model has read it
+            try:
+                probabilities = self.predict_fn(self._buffer[:len(futures)])
+            except Exception as e:
+                logger.error(f"Batch prediction error ({len(futures)} rows): {e}")
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for future, prob_fraud in zip(futures, probabilities):
+                # The client may have disconnected and cancelled its request
+                if not future.done():
+                    future.set_result(float(prob_fraud))
@@ -0,0 +1,43 @@
+"""
+orjson Request Parsing
+======================
+
+FastAPI parses JSON request bodies with the stdlib `json` module via
+`Request.json()`. ORJSONRoute swaps in a Request subclass that decodes the
+body with orjson instead. Pair it with `ORJSONResponse` as the app's
+`default_response_class` so both directions skip stdlib json.
+
+Usage:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.router.route_class = ORJSONRoute  # before any route is declared
+"""
+
+from typing import Any, Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request whose `json()` is decoded by orjson."""
+
+    async def json(self) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI
+        # still turns malformed bodies into a 422 response
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands ORJSONRequest to the endpoint machinery."""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return route_handler
@@ -0,0 +1,56 @@
+"""
+Non-blocking Logging
+====================
+
+`logging` handlers write to the stream while holding a lock, on the thread
+that emitted the record. setup_logging() installs a QueueHandler on the root
+logger instead, so the request path only enqueues the record; a
+QueueListener thread does the formatting and I/O.
+
+The listener thread is restarted in forked children (gunicorn --preload
+imports the app in the master before forking workers).
+
+Calling setup_logging() again only updates the level, so main.py and
+main_mlflow.py can both call it at import time.
+
+Usage:
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Listener installed by the first setup_logging() call
+_LISTENER: Optional[QueueListener] = None
+
+
+def setup_logging(level="INFO") -> QueueListener:
+    """Route root logging through a queue drained by a background thread."""
+    global _LISTENER
+    if _LISTENER is not None:
+        logging.getLogger().setLevel(level)
+        return _LISTENER
+
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    # Threads don't survive fork(); give each worker its own listener
+    os.register_at_fork(after_in_child=listener.start)
+    # Flush records still in the queue on exit
+    atexit.register(listener.stop)
+    _LISTENER = listener
+    return listener
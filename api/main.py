@@ -10,37 +10,90 @@ Objektif:
 Endpoint:
 - GET /: Health check
 - POST /predict: Prediksi fraud untuk transaksi baru
+- POST /predict/batch: Prediksi fraud untuk banyak transaksi sekaligus
 - GET /health: Status aplikasi dan model
 """
 
 from fastapi import FastAPI, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
+import os
+
+# Batas thread OpenMP/BLAS = 1 per worker, harus diset sebelum numpy diimport.
+# Input (1, 30) terlalu kecil untuk diparalelkan, dan paralelisme sudah datang
+# dari jumlah worker (-w $(nproc)), sehingga total thread = jumlah core
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
 import joblib
-import pandas as pd
 import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+import itertools
 import logging
+import operator
+import threading
+import time
 from pathlib import Path
-import os
 from typing import Dict, Any
 
 # Import Pydantic models
-from models import TransactionInput, PredictionResponse, HealthResponse, ErrorResponse
+from models import (
+    FEATURE_ORDER, TransactionInput, TransactionBatch, PredictionResponse, BatchPredictionResponse,
+    HealthResponse, ErrorResponse
+)
+from batching import DynBatcher
+from fast_json import ORJSONRoute
+from logging_setup import setup_logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging: record diantrikan, formatting + I/O di thread terpisah.
+# Di production set LOG_LEVEL=WARNING
+setup_logging(os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
+# Log per-prediksi hanya 1 dari LOG_SAMPLE_RATE request
+LOG_SAMPLE_RATE = max(1, int(os.getenv("LOG_SAMPLE_RATE", "100")))
+_request_counter = itertools.count()
+
+# ONNX Runtime (opsional) untuk inference tree ensemble yang lebih cepat
+try:
+    import onnxruntime as ort
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    logger.warning("onnxruntime/skl2onnx tidak terinstall. Prediksi memakai model sklearn langsung.")
+
+# Numba (opsional) untuk mengompilasi kernel preprocessing ke machine code
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba tidak terinstall. Kernel preprocessing berjalan sebagai Python biasa.")
+
+    def njit(*args, **kwargs):
+        """Fallback: kembalikan fungsi apa adanya"""
+        def decorator(func):
+            return func
+        return decorator
+
 # Inisialisasi FastAPI app
 app = FastAPI(
     title="Real-Time Fraud Detection API",
     description="API untuk deteksi penipuan kartu kredit secara real-time menggunakan Machine Learning",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Parse request body JSON dengan orjson (harus diset sebelum route didefinisikan)
+app.router.route_class = ORJSONRoute
+
 # CORS middleware untuk mengizinkan akses dari frontend
 app.add_middleware(
     CORSMiddleware,
@@ -55,21 +108,97 @@ model = None
 scaler = None
 model_loaded = False
 scaler_loaded = False
+onnx_session = None
+batcher = None
 
 # Path ke model files
 MODEL_PATH = Path("../models/fraud_model.joblib")
 SCALER_PATH = Path("../models/scaler.joblib")
 
+# Urutan fitur harus sama dengan training data (didefinisikan di models.py)
+TIME_IDX = FEATURE_ORDER.index('Time')
+AMOUNT_IDX = FEATURE_ORDER.index('Amount')
+EXPECTED_FIELDS = frozenset(FEATURE_ORDER)
+_get_features = operator.itemgetter(*FEATURE_ORDER)
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+# Buffer (1, 30) per thread untuk preprocessing. Aman dipakai ulang karena
+# batcher langsung menyalin isinya ke buffer batch saat submit()
+_scratch = threading.local()
+
+# Parameter scaler (mean_/scale_ untuk Time dan Amount), di-cache saat startup
+TIME_MEAN, TIME_SCALE = 0.0, 1.0
+AMOUNT_MEAN, AMOUNT_SCALE = 0.0, 1.0
+
+# Set USE_ONNX=0 untuk memaksa prediksi lewat model sklearn
+USE_ONNX = os.getenv("USE_ONNX", "1") == "1"
+ONNX_INPUT_NAME = "X"
+
+def build_feature_scaler(time_amount_scaler) -> StandardScaler:
+    """
+    StandardScaler untuk ke-30 fitur: Time/Amount memakai parameter scaler
+    training, V1-V28 identitas (mean=0, scale=1)
+    """
+    n_features = len(FEATURE_ORDER)
+    columns = [TIME_IDX, AMOUNT_IDX]
+
+    feature_scaler = StandardScaler()
+    feature_scaler.mean_ = np.zeros(n_features)
+    feature_scaler.scale_ = np.ones(n_features)
+    feature_scaler.var_ = np.ones(n_features)
+    feature_scaler.mean_[columns] = time_amount_scaler.mean_
+    feature_scaler.scale_[columns] = time_amount_scaler.scale_
+    feature_scaler.var_[columns] = time_amount_scaler.var_
+    feature_scaler.n_features_in_ = n_features
+    feature_scaler.n_samples_seen_ = time_amount_scaler.n_samples_seen_
+    return feature_scaler
+
+def convert_model_to_onnx(sklearn_model, time_amount_scaler=None):
+    """
+    Convert model sklearn ke ONNX dan buat InferenceSession ONNX Runtime
+
+    Jika scaler diberikan, scaling Time/Amount ikut masuk ke graph ONNX
+    (Pipeline scaler -> model), sehingga input cukup nilai mentah.
+    Batching sudah menangani paralelisme, jadi session cukup 1 thread.
+    """
+    estimator = sklearn_model
+    if time_amount_scaler is not None:
+        estimator = Pipeline([
+            ("scaler", build_feature_scaler(time_amount_scaler)),
+            ("model", sklearn_model),
+        ])
+
+    onnx_model = convert_sklearn(
+        estimator,
+        initial_types=[(ONNX_INPUT_NAME, FloatTensorType([None, len(FEATURE_ORDER)]))],
+        # Output probabilitas sebagai tensor (N, 2), bukan list of dict
+        options={id(sklearn_model): {"zipmap": False}},
+    )
+
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = 1
+
+    return ort.InferenceSession(
+        onnx_model.SerializeToString(),
+        sess_options,
+        providers=["CPUExecutionProvider"],
+    )
+
 def load_model_and_scaler():
     """
     Load model dan scaler saat aplikasi startup
     """
-    global model, scaler, model_loaded, scaler_loaded
+    global model, scaler, model_loaded, scaler_loaded, onnx_session
+    global TIME_MEAN, TIME_SCALE, AMOUNT_MEAN, AMOUNT_SCALE
     
     try:
         # Load model
         if MODEL_PATH.exists():
             model = joblib.load(MODEL_PATH)
+            # Prediksi single-thread: n_jobs>1 memicu pool joblib per panggilan
+            if 'n_jobs' in model.get_params():
+                model.set_params(n_jobs=1)
             model_loaded = True
             logger.info("✅ Model berhasil dimuat")
         else:
@@ -77,59 +206,127 @@ def load_model_and_scaler():
             
         # Load scaler
         if SCALER_PATH.exists():
-            scaler = joblib.load(SCALER_PATH)
+            # Read-only memory map (scaler tidak pernah diubah)
+            scaler = joblib.load(SCALER_PATH, mmap_mode='r')
+            # Scaler di-fit pada [Time, Amount]; simpan parameternya agar
+            # preprocessing tidak perlu memanggil scaler.transform per request
+            TIME_MEAN, AMOUNT_MEAN = float(scaler.mean_[0]), float(scaler.mean_[1])
+            TIME_SCALE, AMOUNT_SCALE = float(scaler.scale_[0]), float(scaler.scale_[1])
             scaler_loaded = True
             logger.info("✅ Scaler berhasil dimuat")
         else:
             logger.error(f"❌ Scaler file tidak ditemukan: {SCALER_PATH}")
+
+        # Konversi scaler + model ke satu graph ONNX
+        if model_loaded and USE_ONNX and ONNX_AVAILABLE:
+            try:
+                onnx_session = convert_model_to_onnx(model, scaler)
+                logger.info("✅ Model dikonversi ke ONNX Runtime")
+
+                # Scaling sudah di dalam graph: preprocessing cukup menyalin nilai
+                if scaler is not None:
+                    TIME_MEAN, TIME_SCALE = 0.0, 1.0
+                    AMOUNT_MEAN, AMOUNT_SCALE = 0.0, 1.0
+            except Exception as e:
+                onnx_session = None
+                logger.warning(f"⚠️ Konversi ONNX gagal, memakai model sklearn: {str(e)}")
             
     except Exception as e:
         logger.error(f"❌ Error loading model/scaler: {str(e)}")
         model_loaded = False
         scaler_loaded = False
 
-def get_risk_level(fraud_probability: float) -> str:
+def predict_fraud_proba(features: np.ndarray) -> np.ndarray:
     """
-    Menentukan level risiko berdasarkan probabilitas fraud
+    Probabilitas fraud untuk matrix fitur (N, 30) yang sudah di-preprocess
+    """
+    if onnx_session is not None:
+        return onnx_session.run(None, {ONNX_INPUT_NAME: features})[1][:, 1]
+    return model.predict_proba(features)[:, 1]
+
+@njit(cache=True, fastmath=True)
+def preprocess_kernel(values, out, time_mean, time_scale, amount_mean, amount_scale):
+    """
+    Salin 30 nilai fitur ke `out` lalu scale Time dan Amount
+    """
+    for i in range(len(values)):
+        out[i] = values[i]
+    out[TIME_IDX] = (values[TIME_IDX] - time_mean) / time_scale
+    out[AMOUNT_IDX] = (values[AMOUNT_IDX] - amount_mean) / amount_scale
+
+@njit(cache=True)
+def risk_level_code(fraud_probability):
+    """
+    Index RISK_LEVELS: 0 = Low, 1 = Medium, 2 = High
     """
     if fraud_probability < 0.3:
-        return "Low"
+        return 0
     elif fraud_probability < 0.7:
-        return "Medium"
+        return 1
     else:
-        return "High"
+        return 2
 
-def preprocess_transaction(transaction: TransactionInput) -> pd.DataFrame:
+def warmup_kernels():
+    """
+    Panggil kernel sekali saat startup agar kompilasi JIT (atau load dari
+    cache di disk) tidak terjadi di request pertama
+    """
+    dummy = np.empty(len(FEATURE_ORDER), dtype=np.float32)
+    preprocess_kernel((0.0,) * len(FEATURE_ORDER), dummy, 0.0, 1.0, 0.0, 1.0)
+    risk_level_code(0.5)
+
+def warmup_model(iterations: int = 5):
+    """
+    Jalankan beberapa prediksi dummy saat startup agar inisialisasi lazy
+    model (ONNX Runtime / sklearn) dan cache CPU tidak dibayar request pertama
+    """
+    dummy = np.zeros((1, len(FEATURE_ORDER)), dtype=np.float32)
+    start = time.perf_counter()
+    predict_fraud_proba(dummy)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        predict_fraud_proba(dummy)
+    warm_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    logger.info(f"🔥 Warmup model: prediksi pertama {first_ms:.2f}ms, setelah warmup {warm_ms:.2f}ms")
+
+def get_scratch_buffer() -> np.ndarray:
+    """
+    Ambil buffer fitur (1, 30) milik thread ini, alokasi sekali saja
+    """
+    buffer = getattr(_scratch, "features", None)
+    if buffer is None:
+        buffer = _scratch.features = np.empty((1, len(FEATURE_ORDER)), dtype=np.float32)
+    return buffer
+
+def get_risk_level(fraud_probability: float) -> str:
+    """
+    Menentukan level risiko berdasarkan probabilitas fraud
+    """
+    return RISK_LEVELS[risk_level_code(fraud_probability)]
+
+def preprocess_transaction(transaction: TransactionInput) -> np.ndarray:
     """
     Preprocessing data transaksi sebelum prediksi
     
     Steps:
-    1. Convert Pydantic model ke DataFrame
-    2. Scale fitur Time dan Amount menggunakan scaler
-    3. Return DataFrame yang siap untuk prediksi
+    1. Ambil nilai fitur sesuai urutan FEATURE_ORDER
+    2. Isi buffer float32 (1, 30) milik thread ini dan scale Time/Amount lewat
+       preprocess_kernel (tanpa scaler, mean=0 dan scale=1 sehingga nilai tidak berubah)
+    3. Return buffer yang siap untuk prediksi (isinya ditimpa request berikutnya)
     """
     try:
-        # Convert ke dictionary
-        transaction_dict = transaction.dict()
-        
-        # Buat DataFrame
-        df = pd.DataFrame([transaction_dict])
-        
-        # Pastikan urutan kolom sesuai dengan training data
-        expected_columns = [
-            'Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 'V10',
-            'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 'V19', 'V20',
-            'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 'V28', 'Amount'
-        ]
-        
-        df = df[expected_columns]
-        
-        # Scale fitur Time dan Amount
-        if scaler is not None:
-            features_to_scale = ['Time', 'Amount']
-            df[features_to_scale] = scaler.transform(df[features_to_scale])
-        
-        return df
+        values = _get_features(transaction.__dict__)
+
+        features = get_scratch_buffer()
+        preprocess_kernel(
+            values, features[0],
+            TIME_MEAN, TIME_SCALE, AMOUNT_MEAN, AMOUNT_SCALE
+        )
+
+        return features
         
     except Exception as e:
         logger.error(f"Error in preprocessing: {str(e)}")
@@ -143,14 +340,31 @@ async def startup_event():
     """
     Event yang dijalankan saat aplikasi startup
     """
+    global batcher
     logger.info("🚀 Starting Fraud Detection API...")
     load_model_and_scaler()
+    warmup_kernels()
     
+    if model_loaded:
+        warmup_model()
+
+        # Gabungkan request yang datang bersamaan menjadi satu panggilan predict_proba
+        batcher = DynBatcher(predict_fraud_proba)
+        await batcher.start()
+
     if model_loaded and scaler_loaded:
         logger.info("✅ API siap digunakan!")
     else:
         logger.warning("⚠️ API berjalan tapi model/scaler tidak dimuat dengan benar")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Event yang dijalankan saat aplikasi shutdown
+    """
+    if batcher is not None:
+        await batcher.stop()
+
 @app.get("/", response_model=Dict[str, str])
 async def root():
     """
@@ -162,7 +376,7 @@ async def root():
         "docs": "/docs"
     }
 
-@app.get("/health", response_model=HealthResponse)
+@app.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check():
     """
     Health check endpoint yang lebih detail
@@ -170,12 +384,12 @@ async def health_check():
     status_msg = "healthy" if (model_loaded and scaler_loaded) else "unhealthy"
     message = "Fraud Detection API is running" if (model_loaded and scaler_loaded) else "Model or scaler not loaded"
 
-    return HealthResponse(
-        status=status_msg,
-        message=message,
-        model_loaded=model_loaded,
-        scaler_loaded=scaler_loaded
-    )
+    return ORJSONResponse({
+        "status": status_msg,
+        "message": message,
+        "model_loaded": model_loaded,
+        "scaler_loaded": scaler_loaded
+    })
 
 @app.post("/debug/validate")
 async def debug_validate(request: Request):
@@ -184,22 +398,17 @@ async def debug_validate(request: Request):
     This helps diagnose validation issues
     """
     try:
+        # Request dari ORJSONRoute, jadi body di-parse dengan orjson
         body = await request.json()
 
         # Check which fields are present
-        expected_fields = [
-            'Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 'V10',
-            'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 'V19', 'V20',
-            'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 'V28', 'Amount'
-        ]
-
-        missing_fields = [field for field in expected_fields if field not in body]
-        extra_fields = [field for field in body.keys() if field not in expected_fields]
+        missing_fields = [field for field in FEATURE_ORDER if field not in body]
+        extra_fields = [field for field in body if field not in EXPECTED_FIELDS]
 
         # Check data types
         type_issues = {}
         for field, value in body.items():
-            if field in expected_fields:
+            if field in EXPECTED_FIELDS:
                 if not isinstance(value, (int, float)):
                     type_issues[field] = f"Expected number, got {type(value).__name__}: {value}"
 
@@ -209,7 +418,7 @@ async def debug_validate(request: Request):
             "missing_fields": missing_fields,
             "extra_fields": extra_fields,
             "type_issues": type_issues,
-            "sample_values": {k: body[k] for k in list(body.keys())[:5]},  # First 5 values
+            "sample_values": {k: body[k] for k in itertools.islice(body, 5)},  # First 5 values
             "is_valid": len(missing_fields) == 0 and len(type_issues) == 0
         }
     except Exception as e:
@@ -218,7 +427,9 @@ async def debug_validate(request: Request):
             "message": "Failed to parse request body"
         }
 
-@app.post("/predict", response_model=PredictionResponse)
+# Skema response tetap terdokumentasi di OpenAPI lewat `responses`, tapi
+# dict hasil prediksi langsung diserialisasi orjson tanpa validasi Pydantic
+@app.post("/predict", response_model=None, responses={200: {"model": PredictionResponse}})
 async def predict_fraud(transaction: TransactionInput, request: Request):
     """
     Endpoint utama untuk prediksi fraud
@@ -229,14 +440,19 @@ async def predict_fraud(transaction: TransactionInput, request: Request):
     Process:
     1. Validasi input (otomatis oleh Pydantic)
     2. Preprocessing data (scaling)
-    3. Prediksi menggunakan model
+    3. Prediksi menggunakan model (di-batch bersama request lain)
     4. Format response
     """
 
-    # Log successful request for debugging (first 5 fields)
-    transaction_dict = transaction.dict()
-    sample_keys = list(transaction_dict.keys())[:5]
-    logger.info(f"Prediction request received - sample fields: {sample_keys}, field count: {len(transaction_dict)}")
+    # Log request (sampled) for debugging (first 5 fields)
+    # __dict__ berisi field yang sudah divalidasi, tanpa membuat dict baru
+    log_this = next(_request_counter) % LOG_SAMPLE_RATE == 0
+    if log_this:
+        transaction_fields = transaction.__dict__
+        logger.info(
+            "Prediction request received - sample fields: %s, field count: %d",
+            list(itertools.islice(transaction_fields, 5)), len(transaction_fields)
+        )
 
     # Cek apakah model dan scaler sudah dimuat
     if not model_loaded or not scaler_loaded:
@@ -247,15 +463,12 @@ async def predict_fraud(transaction: TransactionInput, request: Request):
     
     try:
         # Preprocessing
-        processed_data = preprocess_transaction(transaction)
-        
-        # Prediksi
-        prediction = model.predict(processed_data)[0]
-        probabilities = model.predict_proba(processed_data)[0]
+        features = preprocess_transaction(transaction)
         
-        # Extract probabilities
-        prob_normal = float(probabilities[0])
-        prob_fraud = float(probabilities[1])
+        # Prediksi (predict() == argmax predict_proba(), jadi cukup satu panggilan)
+        prob_fraud = await batcher.submit(features)
+        prob_normal = 1.0 - prob_fraud
+        prediction = 1 if prob_fraud > 0.5 else 0
         
         # Tentukan hasil prediksi dan confidence
         prediction_label = "Fraud" if prediction == 1 else "Normal"
@@ -264,16 +477,17 @@ async def predict_fraud(transaction: TransactionInput, request: Request):
         # Tentukan risk level
         risk_level = get_risk_level(prob_fraud)
         
-        # Log prediksi untuk monitoring
-        logger.info(f"Prediction: {prediction_label}, Confidence: {confidence_score:.4f}, Risk: {risk_level}")
+        # Log prediksi untuk monitoring (sampled, format string lazy)
+        if log_this:
+            logger.info("Prediction: %s, Confidence: %.4f, Risk: %s", prediction_label, confidence_score, risk_level)
         
-        return PredictionResponse(
-            prediction=prediction_label,
-            confidence_score=float(confidence_score),
-            probability_fraud=prob_fraud,
-            probability_normal=prob_normal,
-            risk_level=risk_level
-        )
+        return ORJSONResponse({
+            "prediction": prediction_label,
+            "confidence_score": confidence_score,
+            "probability_fraud": prob_fraud,
+            "probability_normal": prob_normal,
+            "risk_level": risk_level
+        })
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -285,6 +499,57 @@ async def predict_fraud(transaction: TransactionInput, request: Request):
             detail=f"Error dalam prediksi: {str(e)}"
         )
 
+@app.post("/predict/batch", response_model=None, responses={200: {"model": BatchPredictionResponse}})
+async def predict_fraud_batch(batch: TransactionBatch):
+    """
+    Prediksi fraud untuk banyak transaksi sekaligus
+
+    Semua transaksi disusun menjadi satu matrix (N, 30) dan diprediksi dengan
+    satu panggilan model, sehingga overhead Python per baris minimal.
+    """
+    if not model_loaded or not scaler_loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model atau scaler belum dimuat. Silakan coba lagi nanti."
+        )
+
+    try:
+        # Preprocessing: scale kolom Time/Amount untuk semua baris sekaligus
+        features = batch.to_matrix()
+        features[:, TIME_IDX] = (features[:, TIME_IDX] - TIME_MEAN) / TIME_SCALE
+        features[:, AMOUNT_IDX] = (features[:, AMOUNT_IDX] - AMOUNT_MEAN) / AMOUNT_SCALE
+
+        prob_fraud = predict_fraud_proba(features).tolist()
+
+        predictions = []
+        fraud_count = 0
+        for index, p_fraud in enumerate(prob_fraud):
+            p_normal = 1.0 - p_fraud
+            is_fraud = p_fraud > 0.5
+            fraud_count += is_fraud
+            predictions.append({
+                "index": index,
+                "prediction": "Fraud" if is_fraud else "Normal",
+                "confidence_score": p_fraud if is_fraud else p_normal,
+                "probability_fraud": p_fraud,
+                "probability_normal": p_normal,
+                "risk_level": get_risk_level(p_fraud)
+            })
+
+        return ORJSONResponse({
+            "predictions": predictions,
+            "total": len(predictions),
+            "fraud_count": fraud_count,
+            "normal_count": len(predictions) - fraud_count
+        })
+
+    except Exception as e:
+        logger.error(f"Error in batch prediction: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error dalam prediksi batch: {str(e)}"
+        )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -326,7 +591,7 @@ async def http_exception_handler(request, exc):
             error="HTTPException",
             message=exc.detail,
             detail=f"Status code: {exc.status_code}"
-        ).dict()
+        ).model_dump()
     )
 
 @app.exception_handler(Exception)
@@ -341,17 +606,24 @@ async def general_exception_handler(request, exc):
             error="InternalServerError",
             message="Terjadi kesalahan internal server",
             detail=str(exc)
-        ).dict()
+        ).model_dump()
     )
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     
-    # Jalankan server untuk development
+    # Jalankan server: uvloop + httptools, satu worker per core, tanpa access log.
+    # Set API_RELOAD=1 untuk development (reload tidak bisa digabung dengan workers).
+    reload = os.getenv("API_RELOAD", "0") == "1"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=reload,
+        log_level="info" if reload else "warning",
+        access_log=reload
     )
\ No newline at end of file
@@ -12,20 +12,29 @@ Endpoints:
 - GET /: Root endpoint
 - GET /health: System health and model info
 - POST /predict: Fraud prediction for transactions
+- POST /predict/batch: Fraud prediction for many transactions in one call
 - GET /models: List available models in registry
 """
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import pandas as pd
+from fastapi.responses import JSONResponse, ORJSONResponse
+import os
+
+# One OpenMP/BLAS thread per worker; must be set before numpy/lightgbm load.
+# Single-row inputs are too small to parallelize, and gunicorn already runs
+# one worker per core, so extra threads only contend for the same CPUs.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
 import numpy as np
 import joblib
 import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-import os
+import time
 
 # MLflow imports
 import mlflow
@@ -35,11 +44,20 @@ from mlflow.tracking import MlflowClient
 # Pydantic models
 from pydantic import BaseModel, Field
 
+from batching import DynBatcher
+# Imported at module level so MODEL_PREWARM=1 starts loading during app import
+from model_loader import load_model
+# Feature order (must match training data)
+from models import FEATURE_ORDER, TransactionInput, TransactionBatch
+from fast_json import ORJSONRoute
+from logging_setup import setup_logging
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-logging.basicConfig(level=logging.INFO)
+# Records are queued and written by a background thread; use LOG_LEVEL=WARNING in production
+setup_logging(os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
 # MLflow configuration
@@ -47,66 +65,13 @@ MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns")
 MODEL_NAME = "fraud-detector"
 MODEL_STAGE = "Production"  # or "Staging" or "None" for latest
 
-# Feature names (must match training data)
-FEATURE_NAMES = [
-    'Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 'V10',
-    'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 'V19', 'V20',
-    'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 'V28', 'Amount'
-]
+TIME_IDX = FEATURE_ORDER.index('Time')
+AMOUNT_IDX = FEATURE_ORDER.index('Amount')
 
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
 
-class TransactionInput(BaseModel):
-    """Input schema for transaction data."""
-    Time: float = Field(..., description="Time elapsed since first transaction")
-    V1: float = Field(..., description="PCA component 1")
-    V2: float
-    V3: float
-    V4: float
-    V5: float
-    V6: float
-    V7: float
-    V8: float
-    V9: float
-    V10: float
-    V11: float
-    V12: float
-    V13: float
-    V14: float
-    V15: float
-    V16: float
-    V17: float
-    V18: float
-    V19: float
-    V20: float
-    V21: float
-    V22: float
-    V23: float
-    V24: float
-    V25: float
-    V26: float
-    V27: float
-    V28: float
-    Amount: float = Field(..., description="Transaction amount (can be negative if already scaled)")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "Time": 1.39,
-                "V1": -0.67, "V2": 1.41, "V3": -0.36, "V4": 1.27,
-                "V5": -0.18, "V6": 0.49, "V7": -0.58, "V8": -0.03,
-                "V9": -0.47, "V10": -0.43, "V11": 0.89, "V12": -0.63,
-                "V13": -0.16, "V14": -1.07, "V15": 0.29, "V16": -0.22,
-                "V17": -0.26, "V18": 0.15, "V19": -0.03, "V20": 0.07,
-                "V21": 0.17, "V22": 0.29, "V23": 0.06, "V24": -0.03,
-                "V25": 0.36, "V26": -0.10, "V27": 0.06, "V28": -0.03,
-                "Amount": 149.62
-            }
-        }
-
-
 class PredictionResponse(BaseModel):
     """Response schema for predictions."""
     prediction: str = Field(..., description="'Fraud' or 'Normal'")
@@ -118,6 +83,14 @@ class PredictionResponse(BaseModel):
     timestamp: str
 
 
+class BatchPredictionResponse(BaseModel):
+    """Response schema for batch predictions."""
+    predictions: List[PredictionResponse]
+    total: int
+    fraud_count: int
+    normal_count: int
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
@@ -147,9 +120,13 @@ app = FastAPI(
     description="Real-Time Fraud Protection Powered by AI - Advanced fraud detection for credit card transactions",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Decode request bodies with orjson (must be set before routes are declared)
+app.router.route_class = ORJSONRoute
+
 # CORS Configuration
 # Allow frontend to access API from different origins
 allowed_origins = [
@@ -180,7 +157,16 @@ app.add_middleware(
 model = None
 scaler = None
 model_info = {}
+
+# StandardScaler parameters for Time/Amount (model_data['scaling']), set in startup_event
+TIME_MEAN, TIME_SCALE = 0.0, 1.0
+AMOUNT_MEAN, AMOUNT_SCALE = 0.0, 1.0
 mlflow_client = None
+batcher = None
+
+# Response timestamp, reformatted at most once per second
+_now_second = 0
+_now_str = ""
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -204,21 +190,46 @@ def get_risk_level(probability: float) -> str:
         return "Low"
 
 
+def get_timestamp() -> str:
+    """Current local time as an ISO string, cached at 1-second resolution."""
+    global _now_second, _now_str
+    now = int(time.time())
+    if now != _now_second:
+        _now_str = datetime.fromtimestamp(now).isoformat()
+        _now_second = now
+    return _now_str
 
 
-def preprocess_transaction(transaction: Dict[str, float]) -> np.ndarray:
-    """Preprocess transaction data."""
-    # Convert to DataFrame
-    df = pd.DataFrame([transaction])
+def warmup_model(iterations: int = 5):
+    """Run dummy predictions so lazy model initialization happens before traffic."""
+    dummy = np.zeros((1, len(FEATURE_ORDER)), dtype=np.float32)
+    start = time.perf_counter()
+    model.predict(dummy)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        model.predict(dummy)
+    warm_ms = (time.perf_counter() - start) * 1000 / iterations
 
-    # Ensure correct order
-    df = df[FEATURE_NAMES]
+    logger.info(f"🔥 Model warmup: first predict {first_ms:.2f}ms, warm {warm_ms:.2f}ms")
 
-    # Scale Time and Amount if scaler is available
+
+def preprocess_transaction(transaction: Dict[str, float]) -> np.ndarray:
+    """Preprocess transaction data into a (1, 30) float32 row."""
+    # Build the row directly in training feature order
+    features = np.fromiter(
+        (transaction[name] for name in FEATURE_ORDER),
+        dtype=np.float32,
+        count=len(FEATURE_ORDER)
+    ).reshape(1, -1)
+
+    # Scale Time and Amount inline with the cached scaler parameters
     if scaler is not None:
-        df[['Time', 'Amount']] = scaler.transform(df[['Time', 'Amount']])
+        features[0, TIME_IDX] = (transaction['Time'] - TIME_MEAN) / TIME_SCALE
+        features[0, AMOUNT_IDX] = (transaction['Amount'] - AMOUNT_MEAN) / AMOUNT_SCALE
 
-    return df.values
+    return features
 
 
 # ============================================================================
@@ -228,22 +239,42 @@ def preprocess_transaction(transaction: Dict[str, float]) -> np.ndarray:
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup."""
-    global model, scaler, model_metadata
+    global model, scaler, model_metadata, batcher
+    global TIME_MEAN, TIME_SCALE, AMOUNT_MEAN, AMOUNT_SCALE
     logger.info("Starting Fraud Detection API with MLflow...")
     
-    # Use intelligent model loader
-    from model_loader import load_model
+    # Use intelligent model loader (returns the prewarmed model if available)
     loaded_data = load_model()
     
     if loaded_data:
         model = loaded_data.get("model")
         scaler = loaded_data.get("scaler")
         model_metadata = loaded_data.get("metadata", {})
+
+        # Scaling constants extracted from the scaler by the loader, so
+        # preprocessing skips scaler.transform's validation and copies
+        scaling = loaded_data.get("scaling")
+        if scaling:
+            TIME_MEAN, TIME_SCALE = scaling['time_mean'], scaling['time_scale']
+            AMOUNT_MEAN, AMOUNT_SCALE = scaling['amount_mean'], scaling['amount_scale']
+
+        warmup_model()
+
+        # Coalesce concurrent /predict calls into one model.predict on an (N, 30) batch
+        batcher = DynBatcher(lambda X: model.predict(X))
+        await batcher.start()
         logger.info(f"✅ API ready to serve predictions (Source: {model_metadata.get('source', 'unknown')})")
     else:
         logger.error("⚠️  API started but model loading failed!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the request batcher."""
+    if batcher is not None:
+        await batcher.stop()
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -259,18 +290,18 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse)
+@app.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check():
     """Health check endpoint with model info."""
-    return HealthResponse(
-        status="healthy" if model is not None else "degraded",
-        model_loaded=model is not None,
-        model_name=model_info.get('name', 'N/A'),
-        model_version=model_info.get('version', 'N/A'),
-        model_stage=model_info.get('stage', 'N/A'),
-        mlflow_tracking_uri=MLFLOW_TRACKING_URI,
-        timestamp=datetime.now().isoformat()
-    )
+    return ORJSONResponse({
+        "status": "healthy" if model is not None else "degraded",
+        "model_loaded": model is not None,
+        "model_name": model_info.get('name', 'N/A'),
+        "model_version": model_info.get('version', 'N/A'),
+        "model_stage": model_info.get('stage', 'N/A'),
+        "mlflow_tracking_uri": MLFLOW_TRACKING_URI,
+        "timestamp": get_timestamp()
+    })
 
 
 @app.get("/models", response_model=List[ModelInfo])
@@ -301,7 +332,9 @@ async def list_models():
         )
 
 
-@app.post("/predict", response_model=PredictionResponse)
+# The response schemas stay in OpenAPI via `responses`; at runtime the dicts
+# go straight to orjson without Pydantic validation
+@app.post("/predict", response_model=None, responses={200: {"model": PredictionResponse}})
 async def predict_fraud(transaction: TransactionInput):
     """Predict fraud for a transaction."""
     if model is None:
@@ -312,11 +345,11 @@ async def predict_fraud(transaction: TransactionInput):
 
     try:
         # Preprocess
-        transaction_dict = transaction.model_dump()
-        features = preprocess_transaction(transaction_dict)
+        # Validated fields are read straight from __dict__ (no model_dump copy)
+        features = preprocess_transaction(transaction.__dict__)
 
-        # Predict
-        prediction_proba = model.predict(features)[0]
+        # Predict (batched with concurrent requests)
+        prediction_proba = await batcher.submit(features)
         prediction = 1 if prediction_proba > 0.5 else 0
 
         # Calculate probabilities
@@ -326,15 +359,15 @@ async def predict_fraud(transaction: TransactionInput):
         # Determine risk level
         risk = get_risk_level(prob_fraud)
 
-        return PredictionResponse(
-            prediction="Fraud" if prediction == 1 else "Normal",
-            probability_fraud=prob_fraud,
-            probability_normal=prob_normal,
-            confidence_score=max(prob_fraud, prob_normal),
-            risk_level=risk,
-            model_version=model_info.get('version', 'Unknown'),
-            timestamp=datetime.now().isoformat()
-        )
+        return ORJSONResponse({
+            "prediction": "Fraud" if prediction == 1 else "Normal",
+            "probability_fraud": prob_fraud,
+            "probability_normal": prob_normal,
+            "confidence_score": max(prob_fraud, prob_normal),
+            "risk_level": risk,
+            "model_version": model_info.get('version', 'Unknown'),
+            "timestamp": get_timestamp()
+        })
 
     except Exception as e:
         logger.error(f"Prediction error: {e}")
@@ -344,16 +377,77 @@ async def predict_fraud(transaction: TransactionInput):
         )
 
 
+@app.post("/predict/batch", response_model=None, responses={200: {"model": BatchPredictionResponse}})
+async def predict_fraud_batch(batch: TransactionBatch):
+    """Predict fraud for many transactions with a single model call."""
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Please check server logs."
+        )
+
+    try:
+        # Preprocess all rows at once: scale the Time and Amount columns
+        features = batch.to_matrix()
+        if scaler is not None:
+            features[:, TIME_IDX] = (features[:, TIME_IDX] - TIME_MEAN) / TIME_SCALE
+            features[:, AMOUNT_IDX] = (features[:, AMOUNT_IDX] - AMOUNT_MEAN) / AMOUNT_SCALE
+
+        prob_fraud = np.asarray(model.predict(features), dtype=np.float64).tolist()
+
+        model_version = model_info.get('version', 'Unknown')
+        timestamp = get_timestamp()
+        predictions = []
+        fraud_count = 0
+        for index, p_fraud in enumerate(prob_fraud):
+            p_normal = 1.0 - p_fraud
+            is_fraud = p_fraud > 0.5
+            fraud_count += is_fraud
+            predictions.append({
+                "index": index,
+                "prediction": "Fraud" if is_fraud else "Normal",
+                "probability_fraud": p_fraud,
+                "probability_normal": p_normal,
+                "confidence_score": max(p_fraud, p_normal),
+                "risk_level": get_risk_level(p_fraud),
+                "model_version": model_version,
+                "timestamp": timestamp
+            })
+
+        return ORJSONResponse({
+            "predictions": predictions,
+            "total": len(predictions),
+            "fraud_count": fraud_count,
+            "normal_count": len(predictions) - fraud_count
+        })
+
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch prediction failed: {str(e)}"
+        )
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
+
+    # uvloop + httptools, one worker per core, no per-request access log.
+    # Set API_RELOAD=1 for development (reload cannot be combined with workers).
+    reload = os.getenv("API_RELOAD", "0") == "1"
     uvicorn.run(
         "main_mlflow:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=reload,
+        log_level="info" if reload else "warning",
+        access_log=reload
     )
@@ -7,24 +7,60 @@ Supports two modes:
 2. Production: Load from Hugging Face Hub
 
 Set via environment variable: MODEL_SOURCE=mlflow|huggingface
+
+Hugging Face downloads use the standard HF cache, so point HF_HOME at a
+persistent volume to reuse it across restarts and replicas.
+
+Optionally compile LightGBM models with Treelite: TREELITE_COMPILE=1
+
+Set MODEL_PREWARM=1 to start loading in a background thread as soon as this
+module is imported; load_model() then waits for that load instead of
+starting its own. A fork (e.g. gunicorn --preload spawning workers) waits
+for the prewarm load too, so workers inherit the loaded model copy-on-write.
 """
 
 import os
+import io
+import hashlib
+import importlib.util
+import threading
 import joblib
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Download HF files with the Rust hf_transfer client (parallel range requests).
+# huggingface_hub reads these at import time, and fails every download if the
+# flag is set but the package is missing, so only enable it when installed.
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+# Same idea for Xet-backed repos (used by hf_xet when available)
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
 # Try to import optional dependencies
 try:
-    from huggingface_hub import hf_hub_download
+    from huggingface_hub import hf_hub_download, list_repo_files
+    from huggingface_hub.constants import HF_HUB_OFFLINE
+    from huggingface_hub.utils import EntryNotFoundError, LocalEntryNotFoundError, RepositoryNotFoundError
+    # Not worth retrying: the file/repo doesn't exist, or offline and not cached
+    HF_PERMANENT_ERRORS = (EntryNotFoundError, LocalEntryNotFoundError, RepositoryNotFoundError)
     HF_AVAILABLE = True
 except ImportError:
+    HF_PERMANENT_ERRORS = ()
     HF_AVAILABLE = False
     logger.warning("huggingface_hub not installed. HF loading disabled.")
 
+try:
+    from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+    TENACITY_AVAILABLE = True
+except ImportError:
+    TENACITY_AVAILABLE = False
+    logger.warning("tenacity not installed. HF downloads will not be retried.")
+
 try:
     import mlflow
     import mlflow.lightgbm
@@ -34,6 +70,25 @@ except ImportError:
     MLFLOW_AVAILABLE = False
     logger.warning("MLflow not installed. MLflow loading disabled.")
 
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
 
 # Configuration
 MODEL_SOURCE = os.getenv("MODEL_SOURCE", "mlflow")  # "mlflow" or "huggingface"
@@ -41,6 +96,268 @@ HF_MODEL_REPO = os.getenv("HF_MODEL_REPO", "irfankarim/fraud-detection-lightgbm-
 MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns")
 MODEL_NAME = "fraud-detector"
 MODEL_STAGE = "Production"
+TREELITE_COMPILE = os.getenv("TREELITE_COMPILE", "0") == "1"
+TREELITE_LIB_DIR = Path(os.getenv("TREELITE_LIB_DIR", "./treelite_cache"))
+MODEL_PREWARM = os.getenv("MODEL_PREWARM", "0") == "1"
+# Seconds to wait on a model source before also starting the next one
+MODEL_SOURCE_TIMEOUT = float(os.getenv("MODEL_SOURCE_TIMEOUT", "30"))
+
+# Result of the first successful load_model(), shared by all later callers
+_MODEL_CACHE: Optional[Dict[str, Any]] = None
+_MODEL_LOCK = threading.Lock()
+_PREWARM_THREAD: Optional[threading.Thread] = None
+
+
+def _wait_for_prewarm():
+    # Finish the prewarm load before forking so children inherit the loaded
+    # model (shared copy-on-write) instead of each loading their own
+    thread = _PREWARM_THREAD
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+
+
+def _reset_model_lock():
+    # Only the lock is replaced: a lock held by another thread at fork time
+    # would never be released in the child. _MODEL_CACHE is kept on purpose,
+    # it is the model preloaded by the parent
+    global _MODEL_LOCK
+    _MODEL_LOCK = threading.Lock()
+
+
+os.register_at_fork(before=_wait_for_prewarm, after_in_child=_reset_model_lock)
+
+
+class ONNXPredictor:
+    """
+    Model exported to ONNX, served by ONNX Runtime
+
+    Exposes the same predict(X) -> fraud probability contract as
+    lightgbm.Booster. The graph must output class probabilities as an
+    (N, 2) tensor (export with zipmap=False).
+    """
+
+    def __init__(self, path):
+        sess_options = ort.SessionOptions()
+        # Requests are already batched; one thread per call avoids oversubscription
+        sess_options.intra_op_num_threads = 1
+        self._session = ort.InferenceSession(
+            str(path), sess_options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self._session.get_inputs()[0].name
+        # Classifier graphs output (label, probabilities)
+        self._output_name = self._session.get_outputs()[-1].name
+
+    def predict(self, X):
+        probabilities = self._session.run([self._output_name], {self._input_name: X})[0]
+        return probabilities[:, 1]
+
+
+class TreelitePredictor:
+    """
+    LightGBM model compiled to a shared library by Treelite/TL2cgen
+
+    Exposes the same predict(X) -> fraud probability contract as
+    lightgbm.Booster, so callers don't need to know which one they have.
+    """
+
+    def __init__(self, libpath: Path):
+        self.libpath = libpath
+        # Requests are already batched; one thread per call avoids oversubscription
+        self._predictor = tl2cgen.Predictor(str(libpath), nthread=1)
+
+    def predict(self, X):
+        dmat = tl2cgen.DMatrix(X, dtype="float32")
+        return self._predictor.predict(dmat).reshape(-1)
+
+
+def compile_with_treelite(model) -> Optional[TreelitePredictor]:
+    """
+    Compile a LightGBM Booster into a native predictor library
+
+    The library is cached under TREELITE_LIB_DIR keyed by a hash of the
+    model dump and build params, so restarts and sibling workers reuse the
+    same build.
+
+    Returns:
+        TreelitePredictor, or None if the model can't be compiled
+    """
+    if not TREELITE_AVAILABLE:
+        logger.error("Treelite not installed. Install with: pip install treelite tl2cgen")
+        return None
+
+    # Accept both lgb.Booster and the sklearn wrapper (LGBMClassifier)
+    booster = getattr(model, "booster_", model)
+    if not hasattr(booster, "model_to_string"):
+        logger.warning(f"Treelite compile skipped: unsupported model type {type(model).__name__}")
+        return None
+
+    # quantize: thresholds become integer bin indices, so each node compares
+    # ints instead of floats and the compiled trees are more compact
+    params = {"parallel_comp": min(32, os.cpu_count() or 1), "quantize": 1}
+
+    try:
+        model_dump = booster.model_to_string() + repr(sorted(params.items()))
+        model_hash = hashlib.sha256(model_dump.encode()).hexdigest()[:16]
+        libpath = TREELITE_LIB_DIR / f"fraud_model_{model_hash}.so"
+
+        if not libpath.exists():
+            logger.info(f"🔧 Compiling model with Treelite: {libpath}")
+            TREELITE_LIB_DIR.mkdir(parents=True, exist_ok=True)
+            tl_model = treelite.frontend.from_lightgbm(booster)
+
+            # Build under a unique name, then rename atomically so concurrent
+            # workers never load a half-written library
+            tmp_libpath = libpath.with_suffix(f".{os.getpid()}.tmp.so")
+            tl2cgen.export_lib(
+                tl_model,
+                toolchain="gcc",
+                libpath=str(tmp_libpath),
+                params=params
+            )
+            os.replace(tmp_libpath, libpath)
+
+        predictor = TreelitePredictor(libpath)
+        logger.info("✅ Model compiled with Treelite")
+        return predictor
+
+    except Exception as e:
+        logger.error(f"❌ Treelite compile failed, keeping original model: {e}")
+        return None
+
+
+def _zstd_joblib_load(path):
+    """joblib.load from a zstd-compressed pickle, decompressing as it streams"""
+    with open(path, "rb") as f, zstandard.ZstdDecompressor().stream_reader(f) as reader:
+        # BufferedReader adds the peek() joblib uses to sniff the file format
+        return joblib.load(io.BufferedReader(reader, buffer_size=1024 * 1024))
+
+
+def _load_scaler_npz(path) -> "StandardScaler":
+    """
+    Rebuild a fitted StandardScaler from the arrays saved with np.savez
+    
+    Plain arrays load without running the pickle VM (and without executing
+    arbitrary code from the artifact).
+    """
+    from sklearn.preprocessing import StandardScaler
+    
+    with np.load(path, allow_pickle=False) as data:
+        scaler = StandardScaler()
+        scaler.mean_ = data["mean"]
+        scaler.scale_ = data["scale"]
+        scaler.var_ = data["var"]
+        scaler.n_samples_seen_ = data["n"]
+        scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+def load_scaler(path):
+    """
+    Load a scaler saved as .npz arrays, or a joblib/pickle file otherwise
+    
+    joblib scalers are memory-mapped (read-only; the scaler is only ever
+    read), so forked workers share its arrays instead of copying them.
+    """
+    if str(path).endswith(".npz"):
+        return _load_scaler_npz(path)
+    if str(path).endswith(".zst"):
+        return _zstd_joblib_load(path)
+    return joblib.load(path, mmap_mode='r')
+
+
+def load_model_file(path):
+    """
+    Load a model file: ONNX graphs run in ONNX Runtime, LightGBM text dumps
+    are parsed natively by lgb.Booster (neither needs unpickling), anything
+    else goes through joblib
+    
+    Pickled models are loaded with mmap_mode='r': array-backed estimators
+    (sklearn trees) page their arrays in on demand instead of holding a
+    second copy during load, and forked workers share those pages. Model
+    files are never modified in place (HF cache blobs are content-addressed,
+    downloads are renamed into place), so the mapping stays valid.
+    zstd-compressed pickles (.zst, as uploaded by the HF upload script) are
+    decompressed while loading and cannot be memory-mapped.
+    """
+    if str(path).endswith(".onnx"):
+        return ONNXPredictor(path)
+    if str(path).endswith(".txt"):
+        import lightgbm as lgb
+        return lgb.Booster(model_file=str(path))
+    if str(path).endswith(".zst"):
+        return _zstd_joblib_load(path)
+    return joblib.load(path, mmap_mode='r')
+
+
+def _retry_transient(func):
+    """Retry `func` up to 3 times with exponential backoff, except on HF_PERMANENT_ERRORS"""
+    if not TENACITY_AVAILABLE:
+        return func
+    return retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.5, max=4),
+        retry=retry_if_not_exception_type(HF_PERMANENT_ERRORS),
+        reraise=True
+    )(func)
+
+
+@_retry_transient
+def hf_download(filename: str) -> str:
+    """
+    Download a file from HF_MODEL_REPO into the HF cache and return its local path
+    
+    Large files are fetched as parallel range requests by hf_transfer (or
+    hf_xet for Xet-backed repos) when installed; see the top of this module.
+    
+    Raises:
+        EntryNotFoundError / RepositoryNotFoundError: If the file doesn't exist
+    """
+    return hf_hub_download(repo_id=HF_MODEL_REPO, filename=filename)
+
+
+def list_hf_repo_files() -> Optional[Set[str]]:
+    """
+    List the files in HF_MODEL_REPO with a single API call
+    
+    Returns:
+        The set of filenames, or None if the listing is unavailable (offline
+        mode or a transient error); callers then try candidates in order
+    """
+    if HF_HUB_OFFLINE:
+        return None
+    try:
+        return set(list_repo_files(HF_MODEL_REPO))
+    except RepositoryNotFoundError:
+        return set()
+    except Exception as e:
+        logger.warning(f"Could not list files in {HF_MODEL_REPO}: {e}")
+        return None
+
+
+def download_first_available(
+    filenames: List[str], repo_files: Optional[Set[str]] = None
+) -> Optional[Tuple[str, str]]:
+    """
+    Download the first candidate file that exists in the HF repo
+    
+    With `repo_files` (from list_hf_repo_files) only existing candidates are
+    tried, so exactly one file is downloaded. Without it, candidates are
+    tried one at a time in priority order (a miss is a cheap 404, or a cache
+    lookup when offline).
+    
+    Returns:
+        (filename, local_path), or None if no candidate exists
+    """
+    if repo_files is not None:
+        filenames = [filename for filename in filenames if filename in repo_files]
+    for filename in filenames:
+        try:
+            return filename, hf_download(filename)
+        except Exception as e:
+            if repo_files is not None:
+                logger.warning(f"Download of {filename} failed: {e}")
+            continue
+    return None
 
 
 def load_model_from_huggingface() -> Optional[Dict[str, Any]]:
@@ -60,51 +377,44 @@ def load_model_from_huggingface() -> Optional[Dict[str, Any]]:
     try:
         logger.info(f"📦 Loading model from Hugging Face: {HF_MODEL_REPO}")
         
-        # Try to download model with different possible filenames
-        model_path = None
-        model_filename = None
-        
-        for filename in ["model.pkl", "model.joblib", "fraud_model_lgbm.txt"]:
-            try:
-                model_path = hf_hub_download(
-                    repo_id=HF_MODEL_REPO,
-                    filename=filename,
-                    cache_dir="./hf_cache"
-                )
-                model_filename = filename
-                logger.info(f"✅ Found model file: {filename}")
-                break
-            except Exception:
-                continue
+        # List the repo once, then fetch the first existing model and scaler
+        # at the same time (model prefers ONNX, then LightGBM's native text
+        # format; scaler names kept for compatibility)
+        model_filenames = ["fraud_model_lgbm.txt", "model.txt", "model.pkl", "model.joblib"]
+        if ONNX_AVAILABLE:
+            model_filenames.insert(0, "model.onnx")
+        scaler_filenames = [
+            "scaler.npz", "scaler_lgbm.npz",
+            "scaler.joblib", "scaler_lgbm.joblib", "scaler.pkl"
+        ]
+        if ZSTD_AVAILABLE:
+            # Compressed pickles take precedence over their uncompressed names
+            model_filenames[-2:-2] = ["model.pkl.zst", "model.joblib.zst"]
+            scaler_filenames[2:2] = ["scaler.joblib.zst", "scaler_lgbm.joblib.zst", "scaler.pkl.zst"]
+        repo_files = list_hf_repo_files()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            model_probe = executor.submit(download_first_available, model_filenames, repo_files)
+            scaler_probe = executor.submit(download_first_available, scaler_filenames, repo_files)
+            found_model = model_probe.result()
+            found_scaler = scaler_probe.result()
         
-        if not model_path:
-            logger.error(f"❌ Could not find model file (checked: model.pkl, model.joblib) in {HF_MODEL_REPO}")
+        if not found_model:
+            logger.error(f"❌ Could not find model file (checked: {', '.join(model_filenames)}) in {HF_MODEL_REPO}")
             return None
         
-        # Try different scaler filenames (compatibility)
-        scaler_path = None
-        for scaler_filename in ["scaler.joblib", "scaler_lgbm.joblib", "scaler.pkl"]:
-            try:
-                scaler_path = hf_hub_download(
-                    repo_id=HF_MODEL_REPO,
-                    filename=scaler_filename,
-                    cache_dir="./hf_cache"
-                )
-                logger.info(f"Found scaler: {scaler_filename}")
-                break
-            except Exception:
-                continue
+        model_filename, model_path = found_model
+        logger.info(f"✅ Found model file: {model_filename}")
         
-        if not scaler_path:
+        scaler_path = None
+        if found_scaler:
+            scaler_filename, scaler_path = found_scaler
+            logger.info(f"Found scaler: {scaler_filename}")
+        else:
             logger.warning("No scaler found in HF repo, proceeding without scaler")
         
         # Load model and scaler
-        if model_filename.endswith(".txt"):
-            import lightgbm as lgb
-            model = lgb.Booster(model_file=model_path)
-        else:
-            model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path) if scaler_path else None
+        model = load_model_file(model_path)
+        scaler = load_scaler(scaler_path) if scaler_path else None
         
         logger.info("✅ Model loaded successfully from Hugging Face")
         
@@ -123,6 +433,14 @@ def load_model_from_huggingface() -> Optional[Dict[str, Any]]:
         return None
 
 
+def _download_mlflow_scaler(client, run_id: str) -> str:
+    """Download the run's scaler artifact (.npz from newer runs, joblib before that)"""
+    try:
+        return client.download_artifacts(run_id, "scaler.npz")
+    except Exception:
+        return client.download_artifacts(run_id, "scaler.joblib")
+
+
 def load_model_from_mlflow() -> Optional[Dict[str, Any]]:
     """
     Load model from MLflow Model Registry
@@ -168,13 +486,32 @@ def load_model_from_mlflow() -> Optional[Dict[str, Any]]:
             model_version = max(versions, key=lambda v: int(v.version))
             model_uri = f"models:/{MODEL_NAME}/{model_version.version}"
         
-        # Load model
-        model = mlflow.lightgbm.load_model(model_uri)
-        
-        # Load scaler from artifacts
         run_id = model_version.run_id
-        artifact_path = client.download_artifacts(run_id, "scaler.joblib")
-        scaler = joblib.load(artifact_path)
+        
+        # The scaler is an independent artifact of the same run: download it
+        # in the background while the model is fetched and loaded
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            scaler_download = executor.submit(_download_mlflow_scaler, client, run_id)
+            
+            # Load model: an ONNX export or native text dump logged with the run
+            # if there is one, otherwise the registered MLflow model
+            model = None
+            artifact_names = ["fraud_model_lgbm.txt"]
+            if ONNX_AVAILABLE:
+                artifact_names.insert(0, "model.onnx")
+            for artifact_name in artifact_names:
+                try:
+                    model = load_model_file(client.download_artifacts(run_id, artifact_name))
+                    break
+                except Exception:
+                    continue
+            if model is None:
+                model = mlflow.lightgbm.load_model(model_uri)
+            
+            scaler = load_scaler(scaler_download.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         logger.info(f"✅ Model loaded successfully from MLflow (version {model_version.version})")
         
@@ -193,6 +530,26 @@ def load_model_from_mlflow() -> Optional[Dict[str, Any]]:
         return None
 
 
+def find_first_file(candidates: List[Path]) -> Optional[Path]:
+    """
+    Return the first candidate path that exists
+    
+    Each parent directory is listed once with os.scandir instead of one
+    stat() per candidate (each stat is a round-trip on network filesystems).
+    """
+    listings: Dict[Path, set] = {}
+    for path in candidates:
+        if path.parent not in listings:
+            try:
+                with os.scandir(path.parent) as entries:
+                    listings[path.parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[path.parent] = set()
+        if path.name in listings[path.parent]:
+            return path
+    return None
+
+
 def load_model_from_local_files() -> Optional[Dict[str, Any]]:
     """
     Load model from local files (last resort fallback)
@@ -203,32 +560,33 @@ def load_model_from_local_files() -> Optional[Dict[str, Any]]:
     try:
         logger.info("📦 Loading model from local files...")
         
-        # Try common locations
+        # Try common locations (native LightGBM text dump first)
         possible_paths = [
+            Path("models/fraud_model_lgbm.txt"),
+            Path("models/model.txt"),
             Path("models/model.pkl"),
             Path("artifacts/model/model.pkl"),
             Path("mlruns/models/model.pkl"),
         ]
+        if ONNX_AVAILABLE:
+            possible_paths.insert(0, Path("models/model.onnx"))
         
-        model_path = None
-        for path in possible_paths:
-            if path.exists():
-                model_path = path
-                break
+        model_path = find_first_file(possible_paths)
         
         if not model_path:
             logger.error("No local model file found")
             return None
         
         # Load model
-        model = joblib.load(model_path)
+        model = load_model_file(model_path)
         
-        # Try to find scaler
-        scaler_path = model_path.parent / "scaler.joblib"
-        if not scaler_path.exists():
-            scaler_path = model_path.parent / "scaler.pkl"
+        # Try to find scaler next to the model
+        scaler_path = find_first_file([
+            model_path.parent / scaler_name
+            for scaler_name in ["scaler.npz", "scaler_lgbm.npz", "scaler.joblib", "scaler_lgbm.joblib", "scaler.pkl"]
+        ])
         
-        scaler = joblib.load(scaler_path) if scaler_path.exists() else None
+        scaler = load_scaler(scaler_path) if scaler_path else None
         
         logger.info("✅ Model loaded from local files")
         
@@ -249,12 +607,10 @@ def load_model_from_local_files() -> Optional[Dict[str, Any]]:
 
 def load_model() -> Dict[str, Any]:
     """
-    Load model from the configured source with intelligent fallback
+    Load the model once per process and return the cached result afterwards
     
-    Priority:
-    1. Use MODEL_SOURCE env var (mlflow or huggingface)
-    2. Fallback to alternative source if primary fails
-    3. Last resort: local files
+    Thread-safe: concurrent first callers wait for a single load.
+    Use reload_model() to pick up a new model version.
     
     Returns:
         Dict with model, scaler, and metadata
@@ -262,31 +618,109 @@ def load_model() -> Dict[str, Any]:
     Raises:
         RuntimeError: If model cannot be loaded from any source
     """
-    logger.info(f"🚀 Model loading strategy: {MODEL_SOURCE}")
+    global _MODEL_CACHE
+    if _MODEL_CACHE is None:
+        with _MODEL_LOCK:
+            if _MODEL_CACHE is None:
+                _MODEL_CACHE = _load_model_uncached()
+    return _MODEL_CACHE
+
+
+def reload_model() -> Dict[str, Any]:
+    """
+    Discard the cached model and load it again from the configured source
     
-    model_data = None
+    The previous model stays cached if the reload fails.
+    """
+    global _MODEL_CACHE
+    with _MODEL_LOCK:
+        _MODEL_CACHE = _load_model_uncached()
+    return _MODEL_CACHE
+
+
+def _scaler_params(scaler) -> Optional[Dict[str, float]]:
+    """
+    Time/Amount scaling constants from the fitted scaler
+    
+    The scaler is fit on [Time, Amount] (in that order), so preprocessing
+    only needs (x - mean) / scale for two values, without scaler.transform.
+    """
+    if scaler is None:
+        return None
+    return {
+        'time_mean': float(scaler.mean_[0]),
+        'time_scale': float(scaler.scale_[0]),
+        'amount_mean': float(scaler.mean_[1]),
+        'amount_scale': float(scaler.scale_[1]),
+    }
+
+
+def get_model_sources() -> List[Callable[[], Optional[Dict[str, Any]]]]:
+    """
+    Model sources in priority order
     
-    # Try primary source
+    1. MODEL_SOURCE env var (mlflow or huggingface)
+    2. The other cloud source
+    3. Last resort: local files
+    """
     if MODEL_SOURCE.lower() == "huggingface":
-        model_data = load_model_from_huggingface()
-        
-        # Fallback to MLflow if HF fails
-        if not model_data:
-            logger.warning("Hugging Face loading failed, trying MLflow...")
-            model_data = load_model_from_mlflow()
-            
-    else:  # Default to MLflow
-        model_data = load_model_from_mlflow()
-        
-        # Fallback to HF if MLflow fails
-        if not model_data:
-            logger.warning("MLflow loading failed, trying Hugging Face...")
-            model_data = load_model_from_huggingface()
+        return [load_model_from_huggingface, load_model_from_mlflow, load_model_from_local_files]
+    return [load_model_from_mlflow, load_model_from_huggingface, load_model_from_local_files]
+
+
+def _load_model_uncached() -> Dict[str, Any]:
+    """
+    Load model from the configured source with intelligent fallback
     
-    # Last resort: local files
-    if not model_data:
-        logger.warning("All cloud sources failed, trying local files...")
-        model_data = load_model_from_local_files()
+    Sources are tried in priority order. The next source starts only once
+    every running source has failed, or when none of them has finished
+    within MODEL_SOURCE_TIMEOUT seconds (a degraded primary); from then on
+    the first source to succeed wins. A healthy primary source is therefore
+    the only one that downloads and loads a model.
+    
+    Returns:
+        Dict with model, scaler, scaling constants, and metadata
+    
+    Raises:
+        RuntimeError: If model cannot be loaded from any source
+    """
+    logger.info(f"🚀 Model loading strategy: {MODEL_SOURCE}")
+    
+    sources = get_model_sources()
+    model_data = None
+    
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="model-source")
+    try:
+        remaining = list(sources)
+        running = {}
+        while remaining or running:
+            if remaining and not running:
+                source = remaining.pop(0)
+                running[executor.submit(source)] = source
+            done, _ = wait(
+                running, timeout=MODEL_SOURCE_TIMEOUT if remaining else None,
+                return_when=FIRST_COMPLETED
+            )
+            if not done:
+                # Still loading: keep waiting on it, but start the next source too
+                source = remaining.pop(0)
+                logger.warning(
+                    f"No model source finished within {MODEL_SOURCE_TIMEOUT:g}s, "
+                    f"also trying {source.__name__}..."
+                )
+                running[executor.submit(source)] = source
+                continue
+            # Each source logs its own errors and returns None on failure
+            for future in sorted(done, key=lambda f: sources.index(running[f])):
+                source = running.pop(future)
+                model_data = future.result()
+                if model_data:
+                    break
+                logger.warning(f"{source.__name__} failed, falling back to the next source...")
+            if model_data:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # If still no model, raise error
     if not model_data:
@@ -295,5 +729,42 @@ def load_model() -> Dict[str, Any]:
             "Check your MODEL_SOURCE, MLFLOW_TRACKING_URI, or HF_MODEL_REPO configuration."
         )
     
+    model_data['scaling'] = _scaler_params(model_data.get('scaler'))
+    
+    # Single-threaded inference; the API scales out with worker processes
+    model = model_data['model']
+    if hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    
+    if TREELITE_COMPILE:
+        compiled = compile_with_treelite(model_data['model'])
+        if compiled is not None:
+            model_data['model'] = compiled
+            model_data['compiled'] = 'treelite'
+    
     logger.info(f"✅ Model loaded successfully from: {model_data['source']}")
     return model_data
+
+
+def _prewarm():
+    try:
+        load_model()
+    except Exception as e:
+        # load_model() is retried (and the error raised) by the first caller
+        logger.error(f"❌ Model prewarm failed: {e}")
+
+
+def start_prewarm() -> threading.Thread:
+    """
+    Load the model in a daemon thread so download/deserialization overlaps
+    with the rest of application startup
+    """
+    global _PREWARM_THREAD
+    thread = threading.Thread(target=_prewarm, name="model-prewarm", daemon=True)
+    thread.start()
+    _PREWARM_THREAD = thread
+    return thread
+
+
+if MODEL_PREWARM:
+    start_prewarm()
@@ -5,10 +5,20 @@ Real-Time Fraud Detection System
 Objective: Define input and output data structures for API
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+import operator
 import numpy as np
 
+# Feature order expected by the model (same as training data columns);
+# the single source of truth for main.py and main_mlflow.py
+FEATURE_ORDER = (
+    'Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 'V10',
+    'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 'V19', 'V20',
+    'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 'V28', 'Amount'
+)
+_get_feature_values = operator.itemgetter(*FEATURE_ORDER)
+
 class TransactionInput(BaseModel):
     """
     Model for transaction input to be predicted
@@ -53,12 +63,13 @@ class TransactionInput(BaseModel):
     V27: float = Field(..., description="PCA feature V27")
     V28: float = Field(..., description="PCA feature V28")
     
-    class Config:
-        # Allow both str and float to handle JSON number parsing issues
-        # Pydantic will coerce strings to floats automatically
-        validate_assignment = True
-
-        schema_extra = {
+    # Pydantic will coerce numeric strings to floats automatically.
+    # Instances are never mutated after validation, so freeze them: no
+    # assignment validation hooks, and the fields can be read straight
+    # from __dict__ in preprocessing.
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "Time": 406.0,
                 "V1": -1.3598071336738,
@@ -92,6 +103,25 @@ class TransactionInput(BaseModel):
                 "Amount": 149.62
             }
         }
+    )
+
+class TransactionBatch(BaseModel):
+    """
+    Model for batch prediction input (several transactions, one model call)
+    """
+    transactions: List[TransactionInput] = Field(
+        ..., min_length=1, max_length=1000,
+        description="Transactions to predict (1-1000)"
+    )
+
+    def to_matrix(self) -> np.ndarray:
+        """
+        Feature values as a float32 matrix of shape (N, 30) in FEATURE_ORDER
+        """
+        return np.array(
+            [_get_feature_values(t.__dict__) for t in self.transactions],
+            dtype=np.float32
+        )
 
 class PredictionResponse(BaseModel):
     """
@@ -103,8 +133,8 @@ class PredictionResponse(BaseModel):
     probability_normal: float = Field(..., ge=0, le=1, description="Normal probability (0-1)")
     risk_level: str = Field(..., description="Risk level: 'Low', 'Medium', 'High'")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "prediction": "Normal",
                 "confidence_score": 0.9876,
@@ -113,6 +143,16 @@ class PredictionResponse(BaseModel):
                 "risk_level": "Low"
             }
         }
+    )
+
+class BatchPredictionResponse(BaseModel):
+    """
+    Model for batch prediction response
+    """
+    predictions: List[PredictionResponse] = Field(..., description="One prediction per transaction, in input order")
+    total: int = Field(..., description="Number of transactions")
+    fraud_count: int = Field(..., description="Transactions predicted as 'Fraud'")
+    normal_count: int = Field(..., description="Transactions predicted as 'Normal'")
 
 class HealthResponse(BaseModel):
     """
@@ -123,8 +163,8 @@ class HealthResponse(BaseModel):
     model_loaded: bool = Field(..., description="Whether model is loaded")
     scaler_loaded: bool = Field(..., description="Whether scaler is loaded")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "message": "Fraud Detection API is running",
@@ -132,6 +172,7 @@ class HealthResponse(BaseModel):
                 "scaler_loaded": True
             }
         }
+    )
 
 class ErrorResponse(BaseModel):
     """
@@ -141,11 +182,12 @@ class ErrorResponse(BaseModel):
     message: str = Field(..., description="Error message")
     detail: Optional[str] = Field(None, description="Error detail (optional)")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": "ValidationError",
                 "message": "Invalid input data",
                 "detail": "Amount must be a positive number"
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
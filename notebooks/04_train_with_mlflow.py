@@ -35,6 +35,14 @@ import mlflow
 import mlflow.lightgbm
 from mlflow.models import infer_signature
 
+# ONNX export (optional): the API serves model.onnx with onnxruntime if present
+try:
+    import onnxmltools
+    from onnxmltools.convert.common.data_types import FloatTensorType
+    ONNX_EXPORT_AVAILABLE = True
+except ImportError:
+    ONNX_EXPORT_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -43,6 +51,9 @@ from mlflow.models import infer_signature
 MLFLOW_TRACKING_URI = "file:../mlruns"  # Track in root mlruns directory
 EXPERIMENT_NAME = "fraud-detection-lightgbm"
 MODEL_NAME = "fraud-detector"
+# Set MLFLOW_LOG_PLOTS=1 to log the feature importance plot (skipped by
+# default: importing matplotlib and rendering adds ~1s to every run)
+LOG_PLOTS = os.getenv("MLFLOW_LOG_PLOTS", "0") == "1"
 
 # Data paths
 DATA_PATH = Path("../data/creditcard.csv")
@@ -113,6 +124,27 @@ def split_data(X, y, test_size=0.2, random_state=42):
     return X_train, X_test, y_train, y_test
 
 
+def save_scaler_npz(scaler, path):
+    """Save the fitted scaler's arrays as .npz (loaded by the API without pickle)."""
+    np.savez(
+        path,
+        mean=scaler.mean_,
+        scale=scaler.scale_,
+        var=scaler.var_,
+        n=scaler.n_samples_seen_
+    )
+
+
+def save_model_onnx(model, path, n_features):
+    """Export the LightGBM booster to ONNX (probabilities as an (N, 2) tensor)."""
+    onnx_model = onnxmltools.convert_lightgbm(
+        model,
+        initial_types=[('input', FloatTensorType([None, n_features]))],
+        zipmap=False
+    )
+    onnxmltools.utils.save_model(onnx_model, str(path))
+
+
 def calculate_metrics(y_true, y_pred, y_pred_proba):
     """Calculate comprehensive evaluation metrics."""
     metrics = {
@@ -167,18 +199,18 @@ def train_model_with_mlflow():
     # Start MLflow run
     with mlflow.start_run(run_name=f"lightgbm_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
 
-        # Log parameters
+        # Log parameters and dataset info (one log_batch request)
         print("\n📝 Logging parameters to MLflow...")
-        mlflow.log_params(TRAIN_PARAMS)
-        mlflow.log_param("num_boost_round", NUM_BOOST_ROUND)
-        mlflow.log_param("early_stopping_rounds", EARLY_STOPPING_ROUNDS)
-        mlflow.log_param("test_size", 0.2)
-        mlflow.log_param("feature_count", X.shape[1])
-
-        # Log dataset info
-        mlflow.log_param("total_samples", len(X))
-        mlflow.log_param("fraud_samples", int(y.sum()))
-        mlflow.log_param("fraud_rate", float(y.sum() / len(y)))
+        mlflow.log_params({
+            **TRAIN_PARAMS,
+            "num_boost_round": NUM_BOOST_ROUND,
+            "early_stopping_rounds": EARLY_STOPPING_ROUNDS,
+            "test_size": 0.2,
+            "feature_count": X.shape[1],
+            "total_samples": len(X),
+            "fraud_samples": int(y.sum()),
+            "fraud_rate": float(y.sum() / len(y))
+        })
 
         # Create LightGBM datasets
         print("\n🏋️  Training LightGBM model...")
@@ -212,10 +244,9 @@ def train_model_with_mlflow():
         # Calculate metrics
         metrics = calculate_metrics(y_test, y_pred, y_pred_proba)
 
-        # Log metrics to MLflow
+        # Log metrics to MLflow (one log_batch request for all metrics)
         print("\n📈 Logging metrics to MLflow...")
-        for metric_name, metric_value in metrics.items():
-            mlflow.log_metric(metric_name, metric_value)
+        mlflow.log_metrics({name: float(value) for name, value in metrics.items()})
 
         # Print metrics
         print("\n" + "="*70)
@@ -239,20 +270,21 @@ def train_model_with_mlflow():
         }).sort_values('importance', ascending=False)
 
         # Save and log feature importance plot
-        import matplotlib.pyplot as plt
-        plt.figure(figsize=(10, 8))
-        top_features = feature_importance.head(15)
-        plt.barh(top_features['feature'], top_features['importance'])
-        plt.xlabel('Importance (Gain)')
-        plt.title('Top 15 Feature Importance')
-        plt.gca().invert_yaxis()
-        plt.tight_layout()
-
-        feature_plot_path = "feature_importance.png"
-        plt.savefig(feature_plot_path)
-        mlflow.log_artifact(feature_plot_path)
-        plt.close()
-        os.remove(feature_plot_path)
+        if LOG_PLOTS:
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(10, 8))
+            top_features = feature_importance.head(15)
+            plt.barh(top_features['feature'], top_features['importance'])
+            plt.xlabel('Importance (Gain)')
+            plt.title('Top 15 Feature Importance')
+            plt.gca().invert_yaxis()
+            plt.tight_layout()
+
+            feature_plot_path = "feature_importance.png"
+            plt.savefig(feature_plot_path)
+            mlflow.log_artifact(feature_plot_path)
+            plt.close()
+            os.remove(feature_plot_path)
 
         # Create signature for model
         signature = infer_signature(X_train, y_pred_proba)
@@ -268,7 +300,14 @@ def train_model_with_mlflow():
         )
 
         # Save scaler as artifact
+        # scaler.npz: plain arrays, loaded by the API without unpickling
+        # scaler.joblib: kept for older API versions
         print("\n💾 Saving scaler artifact...")
+        scaler_npz_path = "scaler.npz"
+        save_scaler_npz(scaler, scaler_npz_path)
+        mlflow.log_artifact(scaler_npz_path)
+        os.remove(scaler_npz_path)
+
         scaler_path = "scaler.joblib"
         joblib.dump(scaler, scaler_path)
         mlflow.log_artifact(scaler_path)
@@ -281,10 +320,23 @@ def train_model_with_mlflow():
         # Save LightGBM model
         lgbm_path = MODELS_DIR / "fraud_model_lgbm.txt"
         model.save_model(str(lgbm_path))
+        # Native text dump: the API loads it with lgb.Booster, no unpickling
+        mlflow.log_artifact(str(lgbm_path))
+
+        # ONNX export for onnxruntime serving
+        onnx_path = None
+        if ONNX_EXPORT_AVAILABLE:
+            onnx_path = MODELS_DIR / "model.onnx"
+            save_model_onnx(model, onnx_path, n_features=X.shape[1])
+            mlflow.log_artifact(str(onnx_path))
+        else:
+            print("⚠️  onnxmltools not installed, skipping ONNX export")
 
         # Save scaler
         scaler_path = MODELS_DIR / "scaler_lgbm.joblib"
         joblib.dump(scaler, scaler_path)
+        scaler_npz_path = MODELS_DIR / "scaler_lgbm.npz"
+        save_scaler_npz(scaler, scaler_npz_path)
 
         # Save metadata
         metadata = {
@@ -322,7 +374,10 @@ def train_model_with_mlflow():
 
         print(f"\n✅ Model saved locally:")
         print(f"   📁 {lgbm_path}")
+        if onnx_path:
+            print(f"   📁 {onnx_path}")
         print(f"   📁 {scaler_path}")
+        print(f"   📁 {scaler_npz_path}")
         print(f"   📁 {metadata_path}")
 
         # Get run info
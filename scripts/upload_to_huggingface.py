@@ -3,11 +3,40 @@ Upload trained model to Hugging Face Hub for production deployment
 """
 
 import os
+import json
+import hashlib
+import importlib.util
+import mmap
 import joblib
+from fnmatch import fnmatch
 from pathlib import Path
-from huggingface_hub import HfApi, create_repo, login
+
+# Upload large files with the Rust hf_transfer client (parallel multipart).
+# huggingface_hub reads this at import time and fails every transfer if the
+# flag is set but the package is missing, so only enable it when installed.
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+from huggingface_hub import CommitOperationAdd, HfApi
+from huggingface_hub.hf_api import RepoFile
+from huggingface_hub.utils import filter_repo_objects
 from dotenv import load_dotenv
 
+# ONNX export (optional): convert pickled LightGBM models before upload
+try:
+    import onnxmltools
+    from onnxmltools.convert.common.data_types import FloatTensorType
+    ONNX_EXPORT_AVAILABLE = True
+except ImportError:
+    ONNX_EXPORT_AVAILABLE = False
+
+# zstd compression (optional): pickles are uploaded as .zst when available
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -16,6 +45,27 @@ HF_USERNAME = os.getenv("HF_USERNAME", "irfankarim")  # Your HF username
 HF_TOKEN = os.getenv("HF_TOKEN")  # Will be loaded from .env
 REPO_NAME = f"{HF_USERNAME}/fraud-detection-lightgbm-v1"
 MODEL_DIR = Path("mlruns/models")  # Adjust to your model location
+# Look for model in multiple possible locations (searched in this order)
+MODEL_SEARCH_PATHS = (
+    Path("mlruns/models"),
+    Path("models"),
+    Path("artifacts/model"),
+)
+
+# Native LightGBM/ONNX model files: the API loads these without unpickling
+NATIVE_MODEL_FILES = ["fraud_model_lgbm.txt", "model.txt", "model.onnx"]
+# Pickled model files, skipped when a native model is uploaded (scalers are kept)
+PICKLED_MODEL_PATTERNS = ["model.pkl", "model.joblib", "fraud_model*.joblib", "fraud_model*.pkl"]
+# ...including their zstd-compressed copies written by compress_pickles()
+PICKLED_MODEL_IGNORE = PICKLED_MODEL_PATTERNS + [f"{pattern}.zst" for pattern in PICKLED_MODEL_PATTERNS]
+# Local VCS/cache folders never worth uploading (upload_folder skips these too)
+DEFAULT_IGNORE_PATTERNS = [".git/*", "*/.git/*", ".cache/*", "*.zst.tmp"]
+# Last discovered model file, reused while it is unchanged
+MODEL_PATH_CACHE = Path(".model_path_cache.json")
+# zstd level for compressed pickles (3 = fast, still shrinks pickles well)
+ZSTD_LEVEL = 3
+# Files uploaded concurrently in one commit
+UPLOAD_WORKERS = int(os.getenv("HF_UPLOAD_WORKERS", "8"))
 
 def upload_model():
     """Upload model artifacts to Hugging Face Hub"""
@@ -30,19 +80,14 @@ def upload_model():
         print("\n   Get your token from: https://huggingface.co/settings/tokens")
         return
     
-    # Step 2: Login with token
-    print(f"\n🔑 Logging in as: {HF_USERNAME}")
-    try:
-        login(token=HF_TOKEN)
-        print("✅ Login successful!")
-    except Exception as e:
-        print(f"❌ Login failed: {e}")
-        return
+    # One client for every Hub call; the token is passed explicitly instead
+    # of login(), which would write it to the global HF config
+    api = HfApi(token=HF_TOKEN)
     
     # Step 2: Create repository
     print(f"\n📦 Creating repository: {REPO_NAME}")
     try:
-        create_repo(
+        api.create_repo(
             repo_id=REPO_NAME,
             repo_type="model",
             exist_ok=True,
@@ -61,17 +106,47 @@ def upload_model():
     
     print(f"📁 Found model at: {latest_model}")
     
-    # Step 4: Upload files
+    # Step 4: Convert a pickled model to ONNX so the API can serve it natively
+    export_onnx(latest_model)
+    
+    # Step 5: Upload files
     print(f"\n⬆️  Uploading model files...")
-    api = HfApi()
+    
+    # Ship the native model as the primary artifact and leave pickled models out
+    has_native_model = any((latest_model / name).exists() for name in NATIVE_MODEL_FILES)
+    ignore_patterns = DEFAULT_IGNORE_PATTERNS + (PICKLED_MODEL_IGNORE if has_native_model else [])
+    if has_native_model:
+        print("📄 Native model found, skipping pickled model files")
     
     try:
-        # Upload the entire model directory
-        api.upload_folder(
-            folder_path=str(latest_model),
+        # Upload the entire model directory as one commit, with the file
+        # uploads spread over UPLOAD_WORKERS threads sharing one session
+        local_files = sorted(
+            path.relative_to(latest_model).as_posix()
+            for path in latest_model.rglob("*")
+            if path.is_file()
+        )
+        upload_files = compress_pickles(
+            latest_model, filter_repo_objects(local_files, ignore_patterns=ignore_patterns)
+        )
+        
+        # Only send files whose content differs from what the Hub already has
+        remote_files = list_remote_files(api)
+        operations = [
+            CommitOperationAdd(path_in_repo=name, path_or_fileobj=str(latest_model / name))
+            for name in upload_files
+            if file_changed(latest_model / name, remote_files.get(name))
+        ]
+        if not operations:
+            print("✅ Hub already has these model files, nothing to upload")
+            return
+        print(f"📤 Uploading {len(operations)} changed file(s)")
+        api.create_commit(
             repo_id=REPO_NAME,
             repo_type="model",
-            commit_message="Upload fraud detection model"
+            operations=operations,
+            commit_message="Upload fraud detection model",
+            num_threads=UPLOAD_WORKERS
         )
         print("✅ Model uploaded successfully!")
         print(f"\n🎉 View your model at: https://huggingface.co/{REPO_NAME}")
@@ -82,23 +157,172 @@ def upload_model():
         return
 
 
+def compress_pickles(model_dir, names):
+    """
+    Swap each pickled file for a zstd-compressed copy (<name>.zst) next to it
+    
+    The originals stay on disk for local loading; only the .zst goes to the
+    Hub. Copies are rewritten only when the original is newer.
+    """
+    if not ZSTD_AVAILABLE:
+        return list(names)
+    
+    cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+    upload_names = {}
+    for name in names:
+        if not name.endswith((".pkl", ".joblib")):
+            upload_names[name] = None
+            continue
+        
+        src = model_dir / name
+        dst = model_dir / f"{name}.zst"
+        if not dst.exists() or dst.stat().st_mtime < src.stat().st_mtime:
+            # Write to a temp file and rename, so an interrupted run never
+            # leaves a truncated .zst that looks up to date
+            tmp = dst.with_name(dst.name + ".tmp")
+            try:
+                with open(src, "rb") as fi, open(tmp, "wb") as fo:
+                    cctx.copy_stream(fi, fo)
+                os.replace(tmp, dst)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            print(f"🗜️  Compressed {name}: {src.stat().st_size:,} -> {dst.stat().st_size:,} bytes")
+        upload_names[f"{name}.zst"] = None
+    # dict keeps order and drops .zst copies already listed from a previous run
+    return list(upload_names)
+
+
+def list_remote_files(api):
+    """Map each file already in the Hub repo to its RepoFile metadata"""
+    try:
+        return {
+            entry.path: entry
+            for entry in api.list_repo_tree(REPO_NAME, repo_type="model", recursive=True)
+            if isinstance(entry, RepoFile)
+        }
+    except Exception as e:
+        print(f"⚠️  Could not list remote files ({e}), uploading everything")
+        return {}
+
+
+def file_changed(path, remote_file):
+    """Compare a local file against the Hub's LFS SHA-256 or git blob id"""
+    if remote_file is None:
+        return True
+    
+    if remote_file.lfs is not None:
+        digest, remote_digest = hashlib.sha256(), remote_file.lfs.sha256
+    else:
+        # Regular (non-LFS) files are identified by their git blob SHA-1
+        digest, remote_digest = hashlib.sha1(b"blob %d\0" % path.stat().st_size), remote_file.blob_id
+    
+    # Hash straight from the page cache instead of copying the file into memory
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    return digest.hexdigest() != remote_digest
+
+
+def export_onnx(model_dir):
+    """Write model.onnx next to a pickled LightGBM model that has no native copy yet"""
+    if any((model_dir / name).exists() for name in NATIVE_MODEL_FILES):
+        return None
+    
+    pickled = next(
+        (path for path in sorted(model_dir.iterdir())
+         if any(fnmatch(path.name, pattern) for pattern in PICKLED_MODEL_PATTERNS)),
+        None
+    )
+    if pickled is None:
+        return None
+    
+    if not ONNX_EXPORT_AVAILABLE:
+        print("⚠️  onnxmltools not installed, uploading the pickled model as-is")
+        return None
+    
+    onnx_path = model_dir / "model.onnx"
+    try:
+        import lightgbm as lgb
+        
+        model = joblib.load(pickled)
+        # convert_lightgbm only handles LightGBM models (not e.g. the RandomForest)
+        if not isinstance(model, (lgb.LGBMClassifier, lgb.Booster)):
+            print(f"⚠️  {pickled.name} is not a LightGBM model, skipping ONNX export")
+            return None
+        
+        n_features = model.n_features_in_ if isinstance(model, lgb.LGBMClassifier) else model.num_feature()
+        onnx_model = onnxmltools.convert_lightgbm(
+            model,
+            initial_types=[('input', FloatTensorType([None, n_features]))],
+            zipmap=False
+        )
+        onnxmltools.utils.save_model(onnx_model, str(onnx_path))
+    except Exception as e:
+        print(f"⚠️  ONNX export failed ({e}), uploading the pickled model as-is")
+        return None
+    
+    print(f"📄 Exported {pickled.name} to {onnx_path.name}")
+    return onnx_path
+
+
+def _iter_models(base_path):
+    """Yield (is_native, path) for every model file under base_path, depth-first"""
+    stack = [base_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name in NATIVE_MODEL_FILES:
+                    yield True, entry.path
+                elif entry.name.endswith((".pkl", ".joblib")):
+                    yield False, entry.path
+
+
+def _load_cached_model_dir():
+    """Return the cached model directory if its model file is unchanged"""
+    try:
+        cache = json.loads(MODEL_PATH_CACHE.read_text())
+        if os.stat(cache["path"]).st_mtime == cache["mtime"]:
+            return Path(cache["path"]).parent
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_cached_model_dir(model_path):
+    """Remember the discovered model file and its mtime"""
+    try:
+        MODEL_PATH_CACHE.write_text(json.dumps({
+            "path": str(model_path),
+            "mtime": os.stat(model_path).st_mtime,
+        }))
+    except OSError:
+        pass
+    return Path(model_path).parent
+
+
 def find_latest_model():
     """Find the latest trained model in mlruns"""
     
-    # Look for model in multiple possible locations
-    possible_paths = [
-        Path("mlruns/models"),
-        Path("models"),
-        Path("artifacts/model"),
-    ]
+    cached = _load_cached_model_dir()
+    if cached is not None:
+        return cached
     
-    for base_path in possible_paths:
+    for base_path in MODEL_SEARCH_PATHS:
         if base_path.exists():
-            # Find directories with model files
-            model_files = list(base_path.rglob("*.pkl")) + list(base_path.rglob("*.joblib"))
-            if model_files:
-                # Return the parent directory of the first model found
-                return model_files[0].parent
+            # Single walk: stop at the first native model, otherwise fall
+            # back to the first pickled one
+            pickled = None
+            for is_native, path in _iter_models(base_path):
+                if is_native:
+                    return _save_cached_model_dir(path)
+                if pickled is None:
+                    pickled = path
+            if pickled is not None:
+                return _save_cached_model_dir(pickled)
     
     # If no model found in standard locations, ask user
     print("\n⚠️  Could not find model automatically.")
@@ -1,278 +1,125 @@
 """
 Test script to debug 422 validation errors
 This script sends various payloads to test API validation
+
+Run against a running API with pytest (add -n auto for pytest-xdist):
+    pytest test_422_debug.py
+or directly:
+    python test_422_debug.py
+Tests are skipped when the API is not reachable.
 """
 
-import requests
-import json
+import asyncio
+import os
+import sys
+
+import httpx
+import orjson
+import pytest
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from _fixtures import BATCH_BODY, BATCH_SIZE, INCOMPLETE_BODY, SAMPLE_BODY, WRONG_TYPE_BODY
 
 # Railway API URL (update with your actual URL)
 # API_URL = "https://web-production-3c162.up.railway.app"
 # For local testing:
-API_URL = "http://localhost:8000"
-
-def test_health():
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+HEADERS = {"Content-Type": "application/json"}
+
+# Each test prints one NDJSON result line (visible with pytest -s).
+# TEST_VERBOSE=1 adds the response body to every line, not just failing ones
+VERBOSE = os.getenv("TEST_VERBOSE", "0") == "1"
+
+# Transient gateway errors (e.g. a Railway container still starting) are
+# retried with exponential backoff instead of failing the test outright
+RETRIES = 3
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = (502, 503, 504)
+
+class RetryTransport(httpx.AsyncHTTPTransport):
+    """Pooled transport that retries 502/503/504 responses"""
+
+    async def handle_async_request(self, request):
+        # RETRIES sends in total; the last response is returned whatever its status
+        for attempt in range(RETRIES):
+            response = await super().handle_async_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRIES - 1:
+                return response
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+def report(response, ok):
+    """Print this test's result as one compact JSON line and return ok"""
+    # e.g. "test_422_debug.py::test_predict[valid] (call)" -> "test_predict[valid]"
+    test = os.getenv("PYTEST_CURRENT_TEST", "").split(" ")[0].rsplit("::", 1)[-1]
+    line = {"test": test, "status": response.status_code, "ok": ok}
+    if VERBOSE or not ok:
+        try:
+            line["body"] = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            line["body"] = response.text
+    print(orjson.dumps(line).decode())
+    return ok
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def client(anyio_backend):
+    """One pooled (HTTP/2 if available) client shared by every test"""
+    transport = RetryTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=8),
+        retries=RETRIES,  # connection failures
+    )
+    async with httpx.AsyncClient(
+        base_url=API_URL,
+        headers=HEADERS,
+        timeout=10.0,
+        transport=transport,
+    ) as client:
+        # Warm-up: pay DNS/TCP/TLS setup (and a cold container start) once,
+        # before the tests run, so the pool already holds an open connection
+        try:
+            await client.get("/health")
+        except httpx.HTTPError as e:
+            pytest.skip(f"API not reachable at {API_URL}: {e}")
+        yield client
+
+pytestmark = pytest.mark.anyio
+
+async def test_health(client):
     """Test health endpoint"""
-    print("\n" + "="*60)
-    print("Testing /health endpoint")
-    print("="*60)
-
-    try:
-        response = requests.get(f"{API_URL}/health", timeout=10)
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+    response = await client.get("/health")
+    assert report(response, response.status_code == 200)
 
-def test_debug_validate():
+async def test_debug_validate(client):
     """Test debug validation endpoint with sample data"""
-    print("\n" + "="*60)
-    print("Testing /debug/validate endpoint")
-    print("="*60)
-
-    # Sample transaction data
-    sample_data = {
-        "Time": 406.0,
-        "V1": -1.3598071336738,
-        "V2": -0.0727811733098497,
-        "V3": 2.53634673796914,
-        "V4": 1.37815522427443,
-        "V5": -0.338320769942518,
-        "V6": 0.462387777762292,
-        "V7": 0.239598554061257,
-        "V8": 0.0986979012610507,
-        "V9": 0.363786969611213,
-        "V10": 0.0907941719789316,
-        "V11": -0.551599533260813,
-        "V12": -0.617800855762348,
-        "V13": -0.991389847235408,
-        "V14": -0.311169353699879,
-        "V15": 1.46817697209427,
-        "V16": -0.470400525259478,
-        "V17": 0.207971241929242,
-        "V18": 0.0257905801985591,
-        "V19": 0.403992960255733,
-        "V20": 0.251412098239705,
-        "V21": -0.018306777944153,
-        "V22": 0.277837575558899,
-        "V23": -0.110473910188767,
-        "V24": 0.0669280749146731,
-        "V25": 0.128539358273528,
-        "V26": -0.189114843888824,
-        "V27": 0.133558376740387,
-        "V28": -0.0210530534538215,
-        "Amount": 149.62
-    }
-
-    try:
-        response = requests.post(
-            f"{API_URL}/debug/validate",
-            json=sample_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.json().get("is_valid", False)
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
-
-def test_predict_valid():
-    """Test /predict endpoint with valid data"""
-    print("\n" + "="*60)
-    print("Testing /predict endpoint with VALID data")
-    print("="*60)
-
-    sample_data = {
-        "Time": 406.0,
-        "V1": -1.3598071336738,
-        "V2": -0.0727811733098497,
-        "V3": 2.53634673796914,
-        "V4": 1.37815522427443,
-        "V5": -0.338320769942518,
-        "V6": 0.462387777762292,
-        "V7": 0.239598554061257,
-        "V8": 0.0986979012610507,
-        "V9": 0.363786969611213,
-        "V10": 0.0907941719789316,
-        "V11": -0.551599533260813,
-        "V12": -0.617800855762348,
-        "V13": -0.991389847235408,
-        "V14": -0.311169353699879,
-        "V15": 1.46817697209427,
-        "V16": -0.470400525259478,
-        "V17": 0.207971241929242,
-        "V18": 0.0257905801985591,
-        "V19": 0.403992960255733,
-        "V20": 0.251412098239705,
-        "V21": -0.018306777944153,
-        "V22": 0.277837575558899,
-        "V23": -0.110473910188767,
-        "V24": 0.0669280749146731,
-        "V25": 0.128539358273528,
-        "V26": -0.189114843888824,
-        "V27": 0.133558376740387,
-        "V28": -0.0210530534538215,
-        "Amount": 149.62
-    }
-
-    try:
-        response = requests.post(
-            f"{API_URL}/predict",
-            json=sample_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
-
-def test_predict_missing_field():
-    """Test /predict endpoint with missing field (should fail with 422)"""
-    print("\n" + "="*60)
-    print("Testing /predict endpoint with MISSING field")
-    print("="*60)
-
-    # Missing V28
-    incomplete_data = {
-        "Time": 406.0,
-        "V1": -1.3598071336738,
-        "V2": -0.0727811733098497,
-        "V3": 2.53634673796914,
-        "V4": 1.37815522427443,
-        "V5": -0.338320769942518,
-        "V6": 0.462387777762292,
-        "V7": 0.239598554061257,
-        "V8": 0.0986979012610507,
-        "V9": 0.363786969611213,
-        "V10": 0.0907941719789316,
-        "V11": -0.551599533260813,
-        "V12": -0.617800855762348,
-        "V13": -0.991389847235408,
-        "V14": -0.311169353699879,
-        "V15": 1.46817697209427,
-        "V16": -0.470400525259478,
-        "V17": 0.207971241929242,
-        "V18": 0.0257905801985591,
-        "V19": 0.403992960255733,
-        "V20": 0.251412098239705,
-        "V21": -0.018306777944153,
-        "V22": 0.277837575558899,
-        "V23": -0.110473910188767,
-        "V24": 0.0669280749146731,
-        "V25": 0.128539358273528,
-        "V26": -0.189114843888824,
-        "V27": 0.133558376740387,
-        # V28 is missing
-        "Amount": 149.62
-    }
-
-    try:
-        response = requests.post(
-            f"{API_URL}/predict",
-            json=incomplete_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        print(f"\nExpected 422, got {response.status_code}")
-        return response.status_code == 422
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
-
-def test_predict_wrong_type():
-    """Test /predict endpoint with wrong data type (should fail with 422)"""
-    print("\n" + "="*60)
-    print("Testing /predict endpoint with WRONG data type")
-    print("="*60)
-
-    # V1 is a string instead of number
-    wrong_type_data = {
-        "Time": 406.0,
-        "V1": "not a number",  # Wrong type
-        "V2": -0.0727811733098497,
-        "V3": 2.53634673796914,
-        "V4": 1.37815522427443,
-        "V5": -0.338320769942518,
-        "V6": 0.462387777762292,
-        "V7": 0.239598554061257,
-        "V8": 0.0986979012610507,
-        "V9": 0.363786969611213,
-        "V10": 0.0907941719789316,
-        "V11": -0.551599533260813,
-        "V12": -0.617800855762348,
-        "V13": -0.991389847235408,
-        "V14": -0.311169353699879,
-        "V15": 1.46817697209427,
-        "V16": -0.470400525259478,
-        "V17": 0.207971241929242,
-        "V18": 0.0257905801985591,
-        "V19": 0.403992960255733,
-        "V20": 0.251412098239705,
-        "V21": -0.018306777944153,
-        "V22": 0.277837575558899,
-        "V23": -0.110473910188767,
-        "V24": 0.0669280749146731,
-        "V25": 0.128539358273528,
-        "V26": -0.189114843888824,
-        "V27": 0.133558376740387,
-        "V28": -0.0210530534538215,
-        "Amount": 149.62
-    }
-
-    try:
-        response = requests.post(
-            f"{API_URL}/predict",
-            json=wrong_type_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        print(f"\nExpected 422, got {response.status_code}")
-        return response.status_code == 422
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
-
-def main():
-    """Run all tests"""
-    print("\n" + "#"*60)
-    print("# 422 VALIDATION ERROR DEBUG SCRIPT")
-    print("#"*60)
-    print(f"\nAPI URL: {API_URL}")
-
-    results = {
-        "Health Check": test_health(),
-        "Debug Validate": test_debug_validate(),
-        "Valid Prediction": test_predict_valid(),
-        "Missing Field (422)": test_predict_missing_field(),
-        "Wrong Type (422)": test_predict_wrong_type(),
-    }
-
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    for test_name, passed in results.items():
-        status = "[PASS]" if passed else "[FAIL]"
-        print(f"{test_name:.<40} {status}")
-
-    total = len(results)
-    passed = sum(results.values())
-    print(f"\nTotal: {passed}/{total} tests passed")
-
-    if passed == total:
-        print("\n[SUCCESS] All tests passed!")
-    else:
-        print(f"\n[ERROR] {total - passed} test(s) failed")
+    response = await client.post("/debug/validate", content=SAMPLE_BODY)
+    assert report(response, orjson.loads(response.content).get("is_valid", False))
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [(SAMPLE_BODY, 200), (INCOMPLETE_BODY, 422), (WRONG_TYPE_BODY, 422)],
+    ids=["valid", "missing_field", "wrong_type"],
+)
+async def test_predict(client, body, expected):
+    """Test /predict endpoint with valid data, a missing field and a wrong data type"""
+    response = await client.post("/predict", content=body)
+    assert report(response, response.status_code == expected)
+
+async def test_predict_batch(client):
+    """Test /predict/batch endpoint with many valid transactions in one request"""
+    response = await client.post("/predict/batch", content=BATCH_BODY)
+    ok = response.status_code == 200 and len(orjson.loads(response.content)["predictions"]) == BATCH_SIZE
+    assert report(response, ok)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))